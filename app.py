@@ -8,17 +8,24 @@ the extracted metrics through interactive plots in a web interface.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import subprocess
-import tempfile
+import selectors
 import os
 import io
+import mmap
+import hashlib
 import time
 import threading
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import re
+from functools import lru_cache
+from collections import OrderedDict
 from pathlib import Path
 
 # Configure the page
@@ -29,6 +36,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Filename pattern: ue{number}_{direction}_{traffic_type}_b{bandwidth}
+_FILENAME_RE = re.compile(r'u[pe](\d*)_([du][pl])_([a-z]+)_b(\d+)')
+
+_DIRECTION_MAP = {
+    'dl': 'Downlink (Server → UE)',
+    'up': 'Uplink (UE → Server)',
+    'ul': 'Uplink (UE → Server)'
+}
+
+_TRAFFIC_MAP = {
+    'rtt': 'Ping (RTT)',
+    'tcp': 'TCP',
+    'udp': 'UDP'
+}
+
+# Fixed column types of the CSV emitted by scripts/script.pl. Volumes are integers
+# in the log; measurements stay float64 because these frames are exported as CSV
+_ARROW_SCHEMA = {
+    'id': pa.int64(),
+    'latency': pa.int64(),
+    'ue_id': pa.int64(),
+    'ran_ue_id': pa.int64(),
+    'PdcpSduVolumeDL': pa.int64(),
+    'PdcpSduVolumeUL': pa.int64(),
+    'RlcSduDelayDl': pa.float64(),
+    'UEThpDl': pa.float64(),
+    'UEThpUl': pa.float64(),
+    'PrbTotDl': pa.int64(),
+    'PrbTotUl': pa.int64(),
+    'source_file': pa.string()
+}
+
+_CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types=_ARROW_SCHEMA)
+
+def _read_metrics_csv(csv_bytes: bytes) -> pd.DataFrame:
+    """Parse the Perl script's CSV output with Arrow's multithreaded reader."""
+    table = pacsv.read_csv(io.BytesIO(csv_bytes), convert_options=_CSV_CONVERT_OPTIONS)
+    return table.to_pandas()
+
+@lru_cache(maxsize=256)
 def parse_filename_description(filename: str) -> str:
     """
     Parse filename and generate a human-readable description.
@@ -50,8 +97,7 @@ def parse_filename_description(filename: str) -> str:
     
     try:
         # Parse the filename pattern
-        pattern = r'u[pe](\d*)_([du][pl])_([a-z]+)_b(\d+)'
-        match = re.match(pattern, name.lower())
+        match = _FILENAME_RE.match(name.lower())
         
         if not match:
             return f"File: {filename}"
@@ -62,20 +108,10 @@ def parse_filename_description(filename: str) -> str:
         ue_count = int(ue_count_str) if ue_count_str else 1
         
         # Parse direction
-        direction_map = {
-            'dl': 'Downlink (Server → UE)',
-            'up': 'Uplink (UE → Server)',
-            'ul': 'Uplink (UE → Server)'
-        }
-        direction_desc = direction_map.get(direction, direction.upper())
+        direction_desc = _DIRECTION_MAP.get(direction, direction.upper())
         
         # Parse traffic type
-        traffic_map = {
-            'rtt': 'Ping (RTT)',
-            'tcp': 'TCP',
-            'udp': 'UDP'
-        }
-        traffic_desc = traffic_map.get(traffic_type, traffic_type.upper())
+        traffic_desc = _TRAFFIC_MAP.get(traffic_type, traffic_type.upper())
         
         # Format bandwidth
         bandwidth_desc = f"{bandwidth}MHz"
@@ -89,18 +125,76 @@ def parse_filename_description(filename: str) -> str:
         # Fallback to filename if parsing fails
         return f"File: {filename}"
     
+def describe_many(filenames: List[str]) -> List[str]:
+    """
+    Vectorized parse_filename_description for a batch of filenames.
+    
+    Args:
+        filenames: The filenames to parse
+        
+    Returns:
+        Human-readable description strings, in the same order
+    """
+    names = pd.Series(filenames, dtype=object)
+    
+    # Same anchored match as _FILENAME_RE.match, on the lowercased stem
+    stems = names.map(lambda filename: Path(filename).stem).str.lower()
+    parts = stems.str.extract(f"^(?:{_FILENAME_RE.pattern})")
+    ue_count_str, direction, traffic_type, bandwidth = (parts[i] for i in range(4))
+    
+    # Determine UE count (default to 1 if not specified)
+    ue_count = pd.to_numeric(ue_count_str.where(ue_count_str != '', '1'))
+    ue_desc = ue_count.astype('Int64').astype(str) + ' UE' + np.where(ue_count > 1, 's', '')
+    
+    direction_desc = direction.map(_DIRECTION_MAP).fillna(direction.str.upper())
+    traffic_desc = traffic_type.map(_TRAFFIC_MAP).fillna(traffic_type.str.upper())
+    
+    descriptions = '📊 ' + ue_desc.str.cat([direction_desc, traffic_desc, bandwidth + 'MHz'], sep=' | ')
+    
+    # Fallback to filename when the pattern does not match
+    return descriptions.where(parts[0].notna(), 'File: ' + names).tolist()
+
 class RealTimeMetricsProcessor:
     """Processes real-time 5G network log files and monitors for updates."""
     
+    # Terminates each block sent to, and each answer from, the Perl worker
+    WORKER_SENTINEL = b"###END###\n"
+    
+    # Seconds the Perl worker may take to answer one block
+    WORKER_TIMEOUT = 30
+    
     def __init__(self, perl_script_path: str = "scripts/script.pl"):
         self.perl_script_path = perl_script_path
+        self.file_path = None
+        # (st_dev, st_ino) of the file being read, to notice it being recreated
+        self.file_id = None
+        # Set when reading started over on another log; cleared by the caller
+        self.source_changed = False
         self.last_position = 0
+        self.last_size = 0
+        self.last_max_id = 0
+        # ue_ids already received for last_max_id; every UE of a measurement shares its id
+        self.last_id_ues = set()
         self.monitoring = False
+        self._proc = None
+        # (last_position, last_size) after the data last returned by read_new_data,
+        # applied only once process_incremental_data has parsed that data
+        self._pending = None
         
-    def read_new_data(self, file_path: str) -> Optional[str]:
+    def read_new_data(self, file_path: str) -> Optional[bytes]:
         """
         Read new data from file since last position.
         
+        Only whole lines are returned, and the last measurement block is read
+        again on the next call, so an entry that was only partially written is
+        parsed once it is complete; entries already received are dropped by id
+        and UE in process_incremental_data. The read position only moves on
+        once that call has parsed the data, so a failed exchange is retried on
+        the next poll.
+        
+        Reading starts over, with source_changed set, when file_path names a
+        different log than before or the file was truncated or recreated.
+        
         Args:
             file_path: Path to the log file being monitored
             
@@ -108,83 +202,205 @@ class RealTimeMetricsProcessor:
             New content since last read or None if no new data
         """
         try:
-            if not os.path.exists(file_path):
+            # Start from the beginning when a different file is monitored
+            if file_path != self.file_path:
+                self.file_path = file_path
+                self._start_over()
+            
+            # A single stat() is enough to tell that nothing was appended
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                return None
+            file_size = stat.st_size
+            
+            # ...or when the log was recreated or truncated under us
+            file_id = (stat.st_dev, stat.st_ino)
+            if (self.file_id is not None and file_id != self.file_id) or file_size < self.last_size:
+                self._start_over()
+            self.file_id = file_id
+            
+            if file_size <= self.last_size:
                 return None
                 
-            with open(file_path, 'r') as f:
-                f.seek(self.last_position)
-                new_content = f.read()
-                self.last_position = f.tell()
-                
-            return new_content if new_content.strip() else None
+            # Copy only the unread region, straight from the page cache
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = mm[self.last_position:file_size]
+            
+            # A trailing partial line is left for the next poll: Perl would
+            # happily parse a number that is still being written
+            data = data[:data.rfind(b'\n') + 1]
+            if self.last_position + len(data) <= self.last_size:
+                return None
+            
+            # Resume from the start of the last measurement block
+            header = data.rfind(b'KPM ind_msg')
+            if header == -1:
+                header = len(data)
+            self._pending = (self.last_position + data.rfind(b'\n', 0, header) + 1,
+                             self.last_position + len(data))
+            
+            if not data.strip():
+                self._commit_read()
+                return None
+            return data
             
         except Exception as e:
             st.error(f"Error reading file {file_path}: {str(e)}")
             return None
     
-    def process_incremental_data(self, new_content: str, existing_df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+    def process_incremental_data(self, new_content: bytes, chunks: List[pd.DataFrame]) -> Optional[pd.DataFrame]:
         """
-        Process new content and merge with existing DataFrame.
+        Process new content and append it to the accumulated chunks.
         
         Args:
-            new_content: New log content to process
-            existing_df: Existing DataFrame to append to
+            new_content: New raw log content to process
+            chunks: DataFrames received so far, oldest first; extended in place
             
         Returns:
-            Updated DataFrame with new data
+            The newly appended DataFrame or None if there was no new data
         """
         try:
-            # Create temporary file with new content
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(new_content)
-                temp_file_path = temp_file.name
+            # Run the Perl worker on new content
+            stdout = self._send_to_worker(new_content)
             
-            # Run the Perl script on new content
-            try:
-                result = subprocess.run(
-                    ['perl', self.perl_script_path],
-                    stdin=open(temp_file_path, 'r'),
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
+            if stdout:
+                # Parse CSV output
+                new_df = _read_metrics_csv(stdout)
                 
-                if result.returncode == 0 and result.stdout:
-                    # Parse CSV output
-                    csv_data = io.StringIO(result.stdout)
-                    new_df = pd.read_csv(csv_data)
-                    
-                    if existing_df is not None and not existing_df.empty:
-                        # Merge with existing data, avoiding duplicates
-                        max_id = existing_df['id'].max() if 'id' in existing_df.columns else 0
-                        new_df = new_df[new_df['id'] > max_id]
-                        
-                        if not new_df.empty:
-                            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                            return combined_df
-                        else:
-                            return existing_df
-                    else:
-                        return new_df
-                        
-                # Clean up temporary file
-                os.unlink(temp_file_path)
-                return existing_df
+                # Skip measurements we already have, avoiding duplicates; the
+                # last id may still gain the rows of UEs not received yet
+                ids = new_df['id'].values
+                seen = np.isin(new_df['ue_id'].values, list(self.last_id_ues))
+                new_df = new_df[(ids > self.last_max_id) | ((ids == self.last_max_id) & ~seen)]
                 
-            except Exception as e:
-                st.error(f"Error processing incremental data: {str(e)}")
-                return existing_df
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    
+                if new_df.empty:
+                    self._commit_read()
+                    return None
+                
+                # Latency delta continues from the last measurement already received
+                latency_delta = new_df['latency'].diff()
+                if chunks:
+                    latency_delta.iat[0] = new_df['latency'].iat[0] - chunks[-1]['latency'].iat[-1]
+                new_df = new_df.assign(latency_delta=latency_delta)
+                
+                chunks.append(new_df)
+                last_id = int(new_df['id'].iat[-1])
+                last_ues = set(new_df['ue_id'].values[new_df['id'].values == last_id].tolist())
+                if last_id == self.last_max_id:
+                    last_ues |= self.last_id_ues
+                self.last_max_id, self.last_id_ues = last_id, last_ues
+                self._commit_read()
+                return new_df
+                
+            self._commit_read()
+            return None
+            
         except Exception as e:
-            st.error(f"Error creating temporary file: {str(e)}")
-            return existing_df
+            # Keep the old read position so the same data is tried again
+            self._pending = None
+            st.error(f"Error processing incremental data: {str(e)}")
+            return None
+    
+    def _start_over(self):
+        """Forget everything read so far and flag it for the caller."""
+        self.reset_position()
+        self.source_changed = True
+    
+    def _commit_read(self):
+        """Move the read position past the data handed out by read_new_data."""
+        if self._pending is not None:
+            self.last_position, self.last_size = self._pending
+            self._pending = None
 
+    def _send_to_worker(self, content: bytes) -> bytes:
+        """
+        Run content through the long-lived Perl worker and return its CSV output.
+        
+        The worker is started on first use (or after it died) and then kept
+        until close(), so Perl startup is paid once per session. Writing the
+        block and reading the answer share one WORKER_TIMEOUT deadline, so a
+        stalled worker raises instead of hanging the refresh.
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            self.close()
+            self._proc = subprocess.Popen(
+                ['perl', self.perl_script_path, '--worker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            os.set_blocking(self._proc.stdin.fileno(), False)
+        
+        try:
+            stdin_fd = self._proc.stdin.fileno()
+            stdout_fd = self._proc.stdout.fileno()
+            request = memoryview(content + b"\n" + self.WORKER_SENTINEL)
+            response = bytearray()
+            deadline = time.monotonic() + self.WORKER_TIMEOUT
+            
+            with selectors.DefaultSelector() as selector:
+                selector.register(stdin_fd, selectors.EVENT_WRITE)
+                selector.register(stdout_fd, selectors.EVENT_READ)
+                
+                # The answer is at least the CSV header, then the sentinel line
+                answer_end = b"\n" + self.WORKER_SENTINEL
+                while not response.endswith(answer_end):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(self._proc.args, self.WORKER_TIMEOUT)
+                    
+                    for key, _ in selector.select(remaining):
+                        if key.fd == stdin_fd:
+                            request = request[os.write(stdin_fd, request):]
+                            if not request:
+                                selector.unregister(stdin_fd)
+                        else:
+                            chunk = os.read(stdout_fd, 1 << 16)
+                            if not chunk:
+                                raise RuntimeError("Perl worker exited unexpectedly")
+                            response += chunk
+            
+            return bytes(response[:-len(self.WORKER_SENTINEL)])
+            
+        except Exception:
+            # The pipes may be out of step now, so start a fresh worker next time
+            self._proc.kill()
+            self.close()
+            raise
+    
+    def close(self):
+        """Shut down the Perl worker, if one is running, and reap it."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        
+        # Closing stdin makes the worker exit on its own
+        for pipe in (proc.stdin, proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    
+    def __del__(self):
+        # The processor lives in session state; reap the worker with the session
+        self.close()
+    
     def reset_position(self):
-        """Reset file reading position to start."""
+        """Reset file reading position to start and stop the Perl worker."""
         self.last_position = 0
+        self.last_size = 0
+        self.last_max_id = 0
+        self.last_id_ues = set()
+        self.file_id = None
+        self._pending = None
+        self.close()
 
 class NetworkMetricsProcessor:
     """Processes 5G network log files and extracts metrics using the Perl script."""
@@ -203,56 +419,227 @@ class NetworkMetricsProcessor:
         Returns:
             DataFrame with extracted metrics or None if processing fails
         """
-        try:
-            # Create temporary file with the content
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+        return self.process_files({filename: file_content}).get(filename)
+    
+    def process_files(self, files: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """
+        Process several network log files, running Perl once for all new ones.
+        
+        Each file is looked up in the cache by its content alone, so a log
+        re-uploaded under another name or next to other files skips Perl.
+        
+        Args:
+            files: Mapping of filename to file content
             
-            # Run the Perl script
+        Returns:
+            Mapping of filename to its extracted metrics; files that could not
+            be processed are left out
+        """
+        cache, lock = _perl_output_cache()
+        blobs = {filename: content.encode('utf-8') for filename, content in files.items()}
+        digests = {filename: hashlib.blake2b(blob, digest_size=16).hexdigest()
+                   for filename, blob in blobs.items()}
+        
+        with lock:
+            frames = {}
+            for digest in digests.values():
+                if digest in cache:
+                    cache.move_to_end(digest)
+                    frames[digest] = cache[digest]
+        
+        # Only the cache misses go to Perl, in a single batch
+        missing = {digest: blobs[filename] for filename, digest in digests.items()
+                   if digest not in frames}
+        if missing:
+            names = {digest: filename for filename, digest in digests.items()}
+            parsed = self._parse_uncached(missing, names)
+            frames.update(parsed)
+            
+            with lock:
+                cache.update(parsed)
+                while len(cache) > _PERL_CACHE_ENTRIES:
+                    cache.popitem(last=False)
+        
+        # Callers add columns, so never hand out the cached frames themselves
+        return {filename: frames[digest].copy() for filename, digest in digests.items()
+                if digest in frames}
+    
+    def _parse_uncached(self, blobs: Dict[str, bytes], names: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """
+        Run Perl on logs keyed by content digest, reporting failures per file.
+        
+        All logs share one batch run; if it fails, they are retried one at a
+        time so a single bad log does not take the others down with it.
+        """
+        if len(blobs) > 1:
             try:
-                result = subprocess.run(
-                    ['perl', self.perl_script_path],
-                    stdin=open(temp_file_path, 'r'),
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if result.returncode == 0 and result.stdout:
-                    # Parse CSV output
-                    csv_data = io.StringIO(result.stdout)
-                    df = pd.read_csv(csv_data)
-                    
-                    # Add filename for identification
-                    df['source_file'] = filename
-                    
-                    # Clean up temporary file
-                    os.unlink(temp_file_path)
-                    
-                    return df
-                else:
-                    st.error(f"Error processing {filename}: {result.stderr}")
-                    return None
-                    
+                return self._run_batch(blobs)
+            except Exception:
+                pass
+        
+        frames = {}
+        for digest, blob in blobs.items():
+            filename = names[digest]
+            try:
+                frames.update(self._run_batch({digest: blob}))
+            except subprocess.CalledProcessError as e:
+                st.error(f"Error processing {filename}: {e.stderr.decode('utf-8', errors='replace')}")
             except subprocess.TimeoutExpired:
                 st.error(f"Processing timeout for {filename}")
-                return None
             except Exception as e:
                 st.error(f"Error running Perl script for {filename}: {str(e)}")
-                return None
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    
-        except Exception as e:
-            st.error(f"Error creating temporary file for {filename}: {str(e)}")
-            return None
+        return frames
+    
+    def _run_batch(self, blobs: Dict[str, bytes]) -> Dict[str, pd.DataFrame]:
+        """Run one Perl invocation over several logs and split its output by key."""
+        # Each log is introduced by a sentinel line so Perl can tag its rows
+        batch = b"".join(b"\n###FILE:" + key.encode() + b"###\n" + blob for key, blob in blobs.items())
+        
+        # Every log gets the time budget a single-file run would have had
+        stdout = _run_perl(batch, self.perl_script_path, batch=True,
+                           timeout=_PERL_TIMEOUT * len(blobs))
+        if not stdout:
+            raise RuntimeError("no output from Perl script")
+        
+        # Split the combined output back into one DataFrame per log; the key
+        # is the dict key, so the column itself is dropped. A log without any
+        # measurement still gets its (empty) frame, as a single-file run would
+        df = _read_metrics_csv(stdout)
+        groups = {key: group.drop(columns='source_file').reset_index(drop=True)
+                  for key, group in df.groupby('source_file', sort=False)}
+        empty = df.iloc[:0].drop(columns='source_file')
+        return {key: groups.get(key, empty) for key in blobs}
+
+# Seconds allowed for parsing a single log
+_PERL_TIMEOUT = 30
+
+# Number of parsed logs kept in _perl_output_cache
+_PERL_CACHE_ENTRIES = 64
+
+@st.cache_resource(show_spinner=False)
+def _perl_output_cache():
+    """
+    Parsed metrics by log content digest, shared by all sessions.
+    
+    Looked up per file, so renamed or regrouped re-uploads skip the Perl
+    subprocess entirely. Failed logs are never stored.
+    """
+    return OrderedDict(), threading.Lock()
+
+def _run_perl(content_bytes: bytes, perl_script_path: str, batch: bool = False,
+              timeout: float = _PERL_TIMEOUT) -> bytes:
+    """Run the Perl parser on raw log content and return its CSV output."""
+    result = subprocess.run(
+        ['perl', perl_script_path] + (['--batch'] if batch else []),
+        input=content_bytes,
+        capture_output=True,
+        timeout=timeout,
+        check=True
+    )
+    return result.stdout
+
+# Series longer than this are downsampled to _LTTB_POINTS before plotting
+_LTTB_THRESHOLD = 1000
+_LTTB_POINTS = 500
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+    
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previously kept point and the average
+    of the next bucket, which preserves the visual shape of the line.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    
+    xf = x.astype(np.float64)
+    yf = np.nan_to_num(y.astype(np.float64))
+    
+    # Bucket boundaries over the points between the first and the last
+    bounds = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        next_lo, next_hi = (bounds[i + 1], bounds[i + 2]) if i + 2 < len(bounds) else (n - 1, n)
+        avg_x = xf[next_lo:next_hi].mean()
+        avg_y = yf[next_lo:next_hi].mean()
+        
+        area = np.abs(
+            (xf[a] - avg_x) * (yf[lo:hi] - yf[a])
+            - (xf[a] - xf[lo:hi]) * (avg_y - yf[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    
+    return x[selected], y[selected]
+
+def _plot_points(group: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the x/y data of a trace, downsampled when the series is large."""
+    x = group['id'].to_numpy()
+    y = group[column].to_numpy()
+    if len(x) > _LTTB_THRESHOLD:
+        return _lttb(x, y, _LTTB_POINTS)
+    return x, y
+
+def _serialize_frame(df: pd.DataFrame) -> bytes:
+    """Serialize processed metrics to compact Parquet bytes for session storage."""
+    return df.to_parquet(index=False)
+
+def _deserialize_frame(blob: bytes) -> pd.DataFrame:
+    """Decode metrics stored with _serialize_frame."""
+    return pd.read_parquet(io.BytesIO(blob))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _blob_to_csv(blob: bytes) -> bytes:
+    """Serialize stored metrics as CSV for download, once per distinct file."""
+    return _deserialize_frame(blob).to_csv(index=False).encode('utf-8')
 
 class MetricsVisualizer:
     """Creates interactive visualizations for 5G network metrics."""
     
+    # Columns plotted per UE by each create_*_plot method, in trace order
+    LIVE_TRACE_COLUMNS = {
+        'throughput': ('UEThpDl', 'UEThpUl'),
+        'volume': ('PdcpSduVolumeDL', 'PdcpSduVolumeUL'),
+        'delay': ('RlcSduDelayDl',),
+        'prb': ('PrbTotDl', 'PrbTotUl'),
+        'latency': ('latency_delta',)
+    }
+    
+    @classmethod
+    def update_live_plot(cls, plot_name: str, df: pd.DataFrame, title: str) -> go.Figure:
+        """
+        Return the live figure for plot_name, patching its traces in place.
+        
+        Figures are kept in st.session_state.rt_figs and only rebuilt when the
+        set of UEs changes; otherwise just the x/y data of each trace is replaced.
+        """
+        figs = st.session_state.rt_figs
+        groups = list(df.groupby("ue_id"))
+        ue_ids = [ue_id for ue_id, _ in groups]
+        
+        if plot_name not in figs or figs[plot_name][0] != ue_ids:
+            fig = getattr(cls, f"create_{plot_name}_plot")(df, title)
+            figs[plot_name] = (ue_ids, fig)
+            return fig
+        
+        fig = figs[plot_name][1]
+        columns = cls.LIVE_TRACE_COLUMNS[plot_name]
+        with fig.batch_update():
+            for i, (_, group) in enumerate(groups):
+                for j, column in enumerate(columns):
+                    trace = fig.data[i * len(columns) + j]
+                    trace.x, trace.y = _plot_points(group, column)
+        
+        return fig
+    
     @staticmethod
     def create_throughput_plot(df: pd.DataFrame, title: str) -> go.Figure:
         """Create throughput visualization (DL and UL)."""
@@ -263,10 +650,11 @@ class MetricsVisualizer:
         )
 
         for ue_id, group in df.groupby("ue_id"):
+            x, y = _plot_points(group, 'UEThpDl')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['UEThpDl'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - DL',
                     line=dict(width=2),
@@ -275,10 +663,11 @@ class MetricsVisualizer:
                 row=1, col=1
             )
 
+            x, y = _plot_points(group, 'UEThpUl')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['UEThpUl'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - UL',
                     line=dict(width=2),
@@ -304,10 +693,11 @@ class MetricsVisualizer:
         fig = go.Figure()
 
         for ue_id, group in df.groupby("ue_id"):
+            x, y = _plot_points(group, 'PdcpSduVolumeDL')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['PdcpSduVolumeDL'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - DL',
                     line=dict(width=2),
@@ -315,10 +705,11 @@ class MetricsVisualizer:
                 )
             )
 
+            x, y = _plot_points(group, 'PdcpSduVolumeUL')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['PdcpSduVolumeUL'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - UL',
                     line=dict(width=2),
@@ -342,10 +733,11 @@ class MetricsVisualizer:
         fig = go.Figure()
 
         for ue_id, group in df.groupby("ue_id"):
+            x, y = _plot_points(group, 'RlcSduDelayDl')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['RlcSduDelayDl'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - RLC Delay DL',
                     line=dict(width=2),
@@ -369,10 +761,11 @@ class MetricsVisualizer:
         fig = go.Figure()
 
         for ue_id, group in df.groupby("ue_id"):
+            x, y = _plot_points(group, 'PrbTotDl')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['PrbTotDl'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - PRB DL',
                     line=dict(width=2),
@@ -380,10 +773,11 @@ class MetricsVisualizer:
                 )
             )
 
+            x, y = _plot_points(group, 'PrbTotUl')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['PrbTotUl'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - PRB UL',
                     line=dict(width=2),
@@ -407,10 +801,11 @@ class MetricsVisualizer:
         fig = go.Figure()
 
         for ue_id, group in df.groupby("ue_id"):
+            x, y = _plot_points(group, 'latency_delta')
             fig.add_trace(
                 go.Scatter(
-                    x=group['id'],
-                    y=group['latency_delta'],
+                    x=x,
+                    y=y,
                     mode='lines+markers',
                     name=f'{ue_id} - Latency',
                     line=dict(width=2),
@@ -428,13 +823,26 @@ class MetricsVisualizer:
 
         return fig
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _cached_plot(plot_name: str, df_hash: bytes, _df: pd.DataFrame, title: str) -> go.Figure:
+    """
+    Build a file-analysis figure once per plot, dataset and title.
+    
+    The DataFrame itself is excluded from Streamlit's argument hashing and is
+    identified by df_hash, a digest of its serialized form, instead. Returned
+    figures are shared, so callers must not modify them.
+    """
+    return getattr(MetricsVisualizer, f"create_{plot_name}_plot")(_df, title)
+
 def real_time_tab():
     """Real-time monitoring tab functionality."""
     st.header("📈 Real-Time Network Monitoring")
     st.markdown("Monitor live 5G network metrics from a continuously updated log file")
     
-    # Initialize processors
-    rt_processor = RealTimeMetricsProcessor()
+    # Initialize processors (the real-time one keeps its read position across reruns)
+    if 'rt_processor' not in st.session_state:
+        st.session_state.rt_processor = RealTimeMetricsProcessor()
+    rt_processor = st.session_state.rt_processor
     visualizer = MetricsVisualizer()
     
     # File selection
@@ -458,8 +866,12 @@ def real_time_tab():
         monitoring_enabled = st.checkbox("Enable Monitoring", value=False)
     
     # Initialize session state for real-time data
-    if 'rt_data' not in st.session_state:
-        st.session_state.rt_data = pd.DataFrame()
+    if 'rt_chunks' not in st.session_state:
+        st.session_state.rt_chunks = []
+    if 'rt_stats' not in st.session_state:
+        st.session_state.rt_stats = empty_running_stats()
+    if 'rt_figs' not in st.session_state:
+        st.session_state.rt_figs = {}
     if 'rt_last_update' not in st.session_state:
         st.session_state.rt_last_update = None
     if 'rt_monitoring' not in st.session_state:
@@ -469,9 +881,8 @@ def real_time_tab():
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("🔄 Reset Data", disabled=not log_file_path):
-            st.session_state.rt_data = pd.DataFrame()
+            _clear_rt_data()
             rt_processor.reset_position()
-            st.session_state.rt_last_update = None
             st.success("Data reset successfully!")
     
     with col2:
@@ -485,108 +896,192 @@ def real_time_tab():
     with col3:
         st.markdown(f"**Status:** {'🟢 Monitoring' if monitoring_enabled and log_file_path else '🔴 Stopped'}")
     
-    # Auto-refresh logic
+    # Auto-refresh logic: only the live panel reruns on every tick
     if monitoring_enabled and log_file_path:
-        # Create placeholder for auto-refresh
-        placeholder = st.empty()
-        
-        with placeholder.container():
-            # Check for new data
-            new_content = rt_processor.read_new_data(log_file_path)
-            
-            if new_content:
-                # Process new data
-                updated_df = rt_processor.process_incremental_data(new_content, st.session_state.rt_data)
-                updated_df['latency_delta'] = updated_df['latency'].diff()
-                if updated_df is not None:
-                    st.session_state.rt_data = updated_df
-                    st.session_state.rt_last_update = time.time()
-                    
-            # Display current data if available
-            if not st.session_state.rt_data.empty:
-                display_real_time_metrics(st.session_state.rt_data, visualizer)
-            else:
-                st.info("📡 Waiting for data... Make sure the log file path is correct and data is being written to it.")
-                
-        # Auto-refresh the page
-        time.sleep(refresh_interval)
-        st.rerun()
+        st.fragment(run_every=refresh_interval)(_rt_refresh_panel)(log_file_path, visualizer)
     
     elif log_file_path and not monitoring_enabled:
         # Manual mode - show current data without auto-refresh
-        if not st.session_state.rt_data.empty:
-            display_real_time_metrics(st.session_state.rt_data, visualizer)
+        if st.session_state.rt_chunks:
+            display_real_time_metrics(st.session_state.rt_chunks, visualizer)
         else:
             st.info("📡 Click 'Enable Monitoring' to start real-time data collection")
     
     else:
         st.info("📝 Please enter a log file path to begin monitoring")
 
-def display_real_time_metrics(df: pd.DataFrame, visualizer):
+def _rt_refresh_panel(log_file_path: str, visualizer):
+    """Check the monitored file for new data and redraw the live dashboard."""
+    rt_processor = st.session_state.rt_processor
+    
+    # Check for new data
+    new_content = rt_processor.read_new_data(log_file_path)
+    
+    # Another (or a recreated) log starts its ids over; don't mix it with the old one
+    if rt_processor.source_changed:
+        rt_processor.source_changed = False
+        _clear_rt_data()
+    
+    if new_content:
+        # Process new data
+        new_df = rt_processor.process_incremental_data(new_content, st.session_state.rt_chunks)
+        if new_df is not None:
+            update_running_stats(st.session_state.rt_stats, new_df)
+            st.session_state.rt_last_update = time.time()
+            
+    # Display current data if available
+    if st.session_state.rt_chunks:
+        display_real_time_metrics(st.session_state.rt_chunks, visualizer)
+    else:
+        st.info("📡 Waiting for data... Make sure the log file path is correct and data is being written to it.")
+
+def _clear_rt_data():
+    """Drop the measurements, aggregates and figures collected so far."""
+    st.session_state.rt_chunks = []
+    st.session_state.rt_stats = empty_running_stats()
+    st.session_state.rt_figs = {}
+    st.session_state.rt_last_update = None
+
+def empty_running_stats() -> Dict[str, float]:
+    """Create the running aggregates shown on the live dashboard."""
+    return {
+        'n': 0,
+        'sum_dl': 0.0, 'last_dl': 0.0,
+        'sum_ul': 0.0, 'last_ul': 0.0,
+        'n_lat': 0, 'sum_lat': 0.0, 'last_lat': 0.0
+    }
+
+def update_running_stats(stats: Dict[str, float], new_df: pd.DataFrame):
+    """Fold a newly received chunk into the running aggregates."""
+    stats['n'] += len(new_df)
+    stats['sum_dl'] += float(new_df['UEThpDl'].sum())
+    stats['last_dl'] = float(new_df['UEThpDl'].iat[-1])
+    stats['sum_ul'] += float(new_df['UEThpUl'].sum())
+    stats['last_ul'] = float(new_df['UEThpUl'].iat[-1])
+    # The very first latency delta is undefined and left out of the average
+    stats['n_lat'] += int(new_df['latency_delta'].count())
+    stats['sum_lat'] += float(new_df['latency_delta'].sum())
+    stats['last_lat'] = float(new_df['latency_delta'].iat[-1])
+
+def tail_chunks(chunks: List[pd.DataFrame], n: int) -> pd.DataFrame:
+    """Return the last n rows, concatenating only the trailing chunks that cover them."""
+    start = len(chunks)
+    rows = 0
+    while start > 0 and rows < n:
+        start -= 1
+        rows += len(chunks[start])
+    return pd.concat(chunks[start:], ignore_index=True).tail(n)
+
+def display_real_time_metrics(chunks: List[pd.DataFrame], visualizer):
     """Display real-time metrics visualization."""
+    # Aggregates are maintained incrementally as chunks arrive
+    stats = st.session_state.rt_stats
+    
     # Show current statistics
     st.subheader("📊 Live Metrics Dashboard")
     
     # Last update info
     if st.session_state.rt_last_update:
         last_update_str = time.strftime("%H:%M:%S", time.localtime(st.session_state.rt_last_update))
-        st.caption(f"Last updated: {last_update_str} | Total measurements: {len(df)}")
+        st.caption(f"Last updated: {last_update_str} | Total measurements: {stats['n']}")
     
     # Statistics row
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Measurements", len(df))
+        st.metric("Total Measurements", stats['n'])
     with col2:
-        latest_dl = df['UEThpDl'].iloc[-1] if not df.empty else 0
-        avg_dl = df['UEThpDl'].mean() if not df.empty else 0
+        latest_dl = stats['last_dl']
+        avg_dl = stats['sum_dl'] / stats['n'] if stats['n'] else 0
         delta_dl = latest_dl - avg_dl
         st.metric("Current DL Throughput", f"{latest_dl:.2f} kbps", delta=f"{delta_dl:.2f}")
     with col3:
-        latest_ul = df['UEThpUl'].iloc[-1] if not df.empty else 0
-        avg_ul = df['UEThpUl'].mean() if not df.empty else 0
+        latest_ul = stats['last_ul']
+        avg_ul = stats['sum_ul'] / stats['n'] if stats['n'] else 0
         delta_ul = latest_ul - avg_ul
         st.metric("Current UL Throughput", f"{latest_ul:.2f} kbps", delta=f"{delta_ul:.2f}")
     with col4:
-        latest_latency = df['latency_delta'].iloc[-1] if not df.empty else 0
-        avg_latency = df['latency_delta'].mean() if not df.empty else 0
+        latest_latency = stats['last_lat']
+        avg_latency = stats['sum_lat'] / stats['n_lat'] if stats['n_lat'] else float('nan')
         delta_latency = latest_latency - avg_latency
         st.metric("Current Latency", f"{latest_latency:.0f} μs", delta=f"{delta_latency:.0f}")
     
     # Show only recent data for performance (last 50 measurements)
-    display_df = df.tail(50) if len(df) > 50 else df
+    display_df = tail_chunks(chunks, 50)
     
     # Create visualizations
     st.plotly_chart(
-        visualizer.create_throughput_plot(display_df, "Real-Time"),
-        use_container_width=True
+        visualizer.update_live_plot('throughput', display_df, "Real-Time"),
+        use_container_width=True,
+        key="rt_throughput"
     )
     
     col1, col2 = st.columns(2)
     with col1:
         st.plotly_chart(
-            visualizer.create_volume_plot(display_df, "Real-Time"),
-            use_container_width=True
+            visualizer.update_live_plot('volume', display_df, "Real-Time"),
+            use_container_width=True,
+            key="rt_volume"
         )
         st.plotly_chart(
-            visualizer.create_prb_plot(display_df, "Real-Time"),
-            use_container_width=True
+            visualizer.update_live_plot('prb', display_df, "Real-Time"),
+            use_container_width=True,
+            key="rt_prb"
         )
     
     with col2:
         st.plotly_chart(
-            visualizer.create_delay_plot(display_df, "Real-Time"),
-            use_container_width=True
+            visualizer.update_live_plot('delay', display_df, "Real-Time"),
+            use_container_width=True,
+            key="rt_delay"
         )
         st.plotly_chart(
-            visualizer.create_latency_plot(display_df, "Real-Time"),
-            use_container_width=True
+            visualizer.update_live_plot('latency', display_df, "Real-Time"),
+            use_container_width=True,
+            key="rt_latency"
         )
     
     # Show recent raw data
     with st.expander("📋 Recent Raw Data (Last 10 measurements)"):
-        recent_data = df.tail(10)
+        recent_data = tail_chunks(chunks, 10)
         st.dataframe(recent_data, use_container_width=True)
 
+def _process_uploads(processor: NetworkMetricsProcessor, uploaded_files: List) -> None:
+    """
+    Process uploaded files not seen before and store their metrics.
+    
+    Raw file contents only live for the duration of this call; the session
+    keeps just the serialized metrics of each file.
+    """
+    # Read the content of every file not processed yet
+    new_files = {}
+    failed = []
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name in st.session_state.processed_data:
+            continue
+        try:
+            new_files[uploaded_file.name] = uploaded_file.read().decode('utf-8')
+        except UnicodeDecodeError:
+            # Only this upload fails; the others are still processed
+            failed.append(uploaded_file.name)
+    
+    for filename in failed:
+        st.sidebar.error(f"❌ Failed to process {filename}: not a UTF-8 text file")
+    
+    if not new_files:
+        return
+    
+    # Process all new files in one go
+    results = processor.process_files(new_files)
+    
+    for filename in new_files:
+        df = results.get(filename)
+        if df is not None and not df.empty:
+            df['latency_delta'] = df['latency'].diff()
+            st.session_state.processed_data[filename] = _serialize_frame(df)
+            st.sidebar.success(f"✅ {filename}")
+        else:
+            st.sidebar.error(f"❌ Failed to process {filename}")
+
 def non_real_time_tab():
     """Non-real-time file upload and analysis tab."""
     st.header("📁 File-Based Analysis")
@@ -594,7 +1089,6 @@ def non_real_time_tab():
     
     # Initialize processor
     processor = NetworkMetricsProcessor()
-    visualizer = MetricsVisualizer()
     
     # Sidebar for file uploads
     st.sidebar.header("File Upload")
@@ -612,19 +1106,7 @@ def non_real_time_tab():
     # Process uploaded files
     if uploaded_files:
         with st.spinner("Processing uploaded files..."):
-            for uploaded_file in uploaded_files:
-                if uploaded_file.name not in st.session_state.processed_data:
-                    # Read file content
-                    file_content = uploaded_file.read().decode('utf-8')
-                    
-                    # Process the file
-                    df = processor.process_file(file_content, uploaded_file.name)
-                    df['latency_delta'] = df['latency'].diff()
-                    if df is not None and not df.empty:
-                        st.session_state.processed_data[uploaded_file.name] = df
-                        st.sidebar.success(f"✅ {uploaded_file.name}")
-                    else:
-                        st.sidebar.error(f"❌ Failed to process {uploaded_file.name}")
+            _process_uploads(processor, uploaded_files)
     
     # Display results if we have processed data
     if st.session_state.processed_data:
@@ -637,12 +1119,15 @@ def non_real_time_tab():
             tab_names.append(Path(filename).stem)
         
         tabs = st.tabs(tab_names)
+        descriptions = describe_many(list(st.session_state.processed_data.keys()))
         
-        for i, (filename, df) in enumerate(st.session_state.processed_data.items()):
+        for i, (filename, blob) in enumerate(st.session_state.processed_data.items()):
+            # Processed data is kept serialized and only decoded for display
+            df = _deserialize_frame(blob)
+            
             with tabs[i]:
                 # Show filename description
-                description = parse_filename_description(filename)
-                st.markdown(f"### {description}")
+                st.markdown(f"### {descriptions[i]}")
                 st.caption(f"Analysis for file: `{filename}`")
                 
                 # Show basic statistics
@@ -659,42 +1144,42 @@ def non_real_time_tab():
                         st.metric("Avg UL Thp", f"{df_ue['UEThpUl'].mean():.2f} kbps")
                         st.metric("Avg RLC Delay", f"{df_ue['RlcSduDelayDl'].mean():.2f} μs")
                 
-                # Create visualizations
+                # Create visualizations (reused across reruns while the data is unchanged)
+                df_hash = hashlib.blake2b(blob, digest_size=16).digest()
                 st.plotly_chart(
-                    visualizer.create_throughput_plot(df, filename),
+                    _cached_plot('throughput', df_hash, df, filename),
                     use_container_width=True
                 )
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.plotly_chart(
-                        visualizer.create_volume_plot(df, filename),
+                        _cached_plot('volume', df_hash, df, filename),
                         use_container_width=True
                     )
                     st.plotly_chart(
-                        visualizer.create_prb_plot(df, filename),
+                        _cached_plot('prb', df_hash, df, filename),
                         use_container_width=True
                     )
                 
                 with col2:
                     st.plotly_chart(
-                        visualizer.create_delay_plot(df, filename),
+                        _cached_plot('delay', df_hash, df, filename),
                         use_container_width=True
                     )
                     st.plotly_chart(
-                        visualizer.create_latency_plot(df, filename),
+                        _cached_plot('latency', df_hash, df, filename),
                         use_container_width=True
                     )
                 
                 # Show raw data
                 with st.expander("📋 View Raw Data"):
-                    st.dataframe(df.drop('source_file', axis=1), use_container_width=True)
+                    st.dataframe(df, use_container_width=True)
                 
                 # Download processed data
-                csv = df.to_csv(index=False)
                 st.download_button(
                     label=f"📥 Download {filename} as CSV",
-                    data=csv,
+                    data=_blob_to_csv(blob),
                     file_name=f"{filename}_processed.csv",
                     mime="text/csv"
                 )
@@ -9,7 +9,22 @@ my @headers = qw(
     PrbTotDl PrbTotUl
 );
 
-print join(",", @headers), "\n";
+# --batch: the input holds several logs, each introduced by a
+# "###FILE:<name>###" line, and every row gets a source_file column.
+# --worker: keep running and answer every block of input terminated by a
+# "###END###" line with its own CSV, followed by a "###END###" line.
+my ($batch, $worker) = (0, 0);
+while (@ARGV && $ARGV[0] =~ /^--(batch|worker)$/) {
+    shift @ARGV;
+    $batch = 1 if $1 eq 'batch';
+    $worker = 1 if $1 eq 'worker';
+}
+my $source_file = '';
+my $output = '';
+$| = 1 if $worker;
+
+my $header_line = join(",", @headers, $batch ? ('source_file') : ()) . "\n";
+emit($header_line);
 
 my @entries;
 my %current_entry;
@@ -19,11 +34,24 @@ my $current_latency;
 while (<>) {
     chomp;
 
-    if (/^\s*(\d+)\s+KPM ind_msg latency\s*=\s*(\d+)/) {
-        for my $entry (@entries) {
-            print_entry($entry, \@headers) if is_complete($entry, \@headers);
-        }
-        @entries = ();
+    if ($worker && /^###END###$/) {
+        flush_entries();
+        print $output, "###END###\n";
+        $output = '';
+        emit($header_line);
+        $current_id = undef;
+        $current_latency = undef;
+        %current_entry = ();
+    }
+    elsif ($batch && /^###FILE:(.*)###$/) {
+        flush_entries();
+        $source_file = $1;
+        $current_id = undef;
+        $current_latency = undef;
+        %current_entry = ();
+    }
+    elsif (/^\s*(\d+)\s+KPM ind_msg latency\s*=\s*(\d+)/) {
+        flush_entries();
         $current_id = $1;
         $current_latency = $2;
         %current_entry = ();
@@ -61,8 +89,13 @@ while (<>) {
     }
 }
 
-for my $entry (@entries) {
-    print_entry($entry, \@headers) if is_complete($entry, \@headers);
+flush_entries();
+
+sub flush_entries {
+    for my $entry (@entries) {
+        print_entry($entry, \@headers) if is_complete($entry, \@headers);
+    }
+    @entries = ();
 }
 
 sub is_complete {
@@ -75,5 +108,18 @@ sub is_complete {
 
 sub print_entry {
     my ($entry, $headers) = @_;
-    print join(",", map { $entry->{$_} } @$headers), "\n";
+    my @fields = map { $entry->{$_} } @$headers;
+    push @fields, '"' . ($source_file =~ s/"/""/gr) . '"' if $batch;
+    emit(join(",", @fields) . "\n");
+}
+
+sub emit {
+    my ($line) = @_;
+    # A worker sends each answer whole, once its block is complete
+    if ($worker) {
+        $output .= $line;
+    }
+    else {
+        print $line;
+    }
 }
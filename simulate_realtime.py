@@ -4,46 +4,220 @@ Real-time log simulator for testing the 5G metrics analyzer.
 This script continuously appends new log entries to a file to simulate real-time data.
 """
 
+import os
+import sys
 import time
-import random
+import queue
+import threading
 import argparse
 from pathlib import Path
 
+import numpy as np
+from numpy.random import Generator, SFC64
+
+# Realistic latency base (around 1.7e15 microseconds)
+BASE_LATENCY = 1748351985647759
+
+# Most entries generated in one go by the paced loop
+BATCH_SIZE = 1024
+
+# SFC64 is the cheapest bit generator numpy ships; its quality is ample here
+RNG = Generator(SFC64())
+# Bound once so generate_log_entry skips the attribute lookup on every draw
+_integers = RNG.integers
+_uniform = RNG.uniform
+
+# Raw append-only output; O_APPEND lets the kernel position every write
+OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0)
+
+# Start-up banner of the xApp, written once when the log is created
+HEADER_BYTES = (
+    b"[UTIL]: Setting the config -c file to /local/etc/flexric/flexric.conf\n"
+    b"[UTIL]: Setting path -p for the shared libraries to /local/lib/flexric/\n"
+    b"[xAapp]: Initializing ...\n"
+    b"[xApp]: nearRT-RIC IP Address = 127.0.0.1, PORT = 36422\n"
+    b"Connected E2 nodes = 1\n"
+    b"[xApp]: Successfully subscribed to RAN_FUNC_ID 2\n\n"
+)
+
+# Lines that are identical in every entry (single UE on a single gNB)
+_UE_LINES = "UE ID type = gNB, amf_ue_ngap_id = 1\nran_ue_id = 1\n"
+
+# One KPM indication as printed by the xApp. Filled positionally with
+# (entry_id, latency, dl_volume, ul_volume, rlc_delay, dl_throughput,
+#  ul_throughput, prb_dl, prb_ul); a tuple % beats f-strings and dict lookups.
+# _UE_LINES is spliced in once here, so per entry it is a plain copy
+_TEMPLATE = "\n      %d KPM ind_msg latency = %d [μs]\n" + _UE_LINES + """\
+DRB.PdcpSduVolumeDL = %d [kb]
+DRB.PdcpSduVolumeUL = %d [kb]
+DRB.RlcSduDelayDl = %.2f [μs]
+DRB.UEThpDl = %.2f [kbps]
+DRB.UEThpUl = %.2f [kbps]
+RRU.PrbTotDl = %d [PRBs]
+RRU.PrbTotUl = %d [PRBs]
+"""
+# Encoded once, so the write paths format straight to UTF-8 bytes
+_TEMPLATE_B = _TEMPLATE.encode('utf-8')
+
 def generate_log_entry(entry_id: int) -> str:
     """Generate a single log entry with random but realistic values."""
     
-    # Generate realistic latency (around 1.7e15 microseconds base)
-    base_latency = 1748351985647759
-    latency = base_latency + random.randint(-1000000, 1000000)
+    # Generate realistic latency
+    latency = BASE_LATENCY + int(_integers(-1000000, 1000001))
     
     # Generate realistic throughput values
-    dl_throughput = random.uniform(100000, 1500000)  # 100-1500 kbps
-    ul_throughput = random.uniform(1000, 15000)      # 1-15 kbps
+    dl_throughput = float(_uniform(100000, 1500000))  # 100-1500 kbps
+    ul_throughput = float(_uniform(1000, 15000))      # 1-15 kbps
     
     # Generate realistic volume values (proportional to throughput)
-    dl_volume = int(dl_throughput * random.uniform(0.8, 1.2))
-    ul_volume = int(ul_throughput * random.uniform(0.8, 1.2))
+    dl_volume = int(dl_throughput * _uniform(0.8, 1.2))
+    ul_volume = int(ul_throughput * _uniform(0.8, 1.2))
     
     # Generate realistic delay values
-    rlc_delay = random.uniform(3000, 8000)  # 3-8 ms
+    rlc_delay = float(_uniform(3000, 8000))  # 3-8 ms
     
     # Generate realistic PRB values
-    prb_dl = int(dl_throughput * random.uniform(0.1, 0.2))
-    prb_ul = int(ul_throughput * random.uniform(0.5, 1.0))
-    
-    log_entry = f"""
-      {entry_id} KPM ind_msg latency = {latency} [μs]
-UE ID type = gNB, amf_ue_ngap_id = 1
-ran_ue_id = 1
-DRB.PdcpSduVolumeDL = {dl_volume} [kb]
-DRB.PdcpSduVolumeUL = {ul_volume} [kb]
-DRB.RlcSduDelayDl = {rlc_delay:.2f} [μs]
-DRB.UEThpDl = {dl_throughput:.2f} [kbps]
-DRB.UEThpUl = {ul_throughput:.2f} [kbps]
-RRU.PrbTotDl = {prb_dl} [PRBs]
-RRU.PrbTotUl = {prb_ul} [PRBs]
-"""
-    return log_entry
+    prb_dl = int(dl_throughput * _uniform(0.1, 0.2))
+    prb_ul = int(ul_throughput * _uniform(0.5, 1.0))
+    
+    return format_log_entry(entry_id, latency, dl_throughput, ul_throughput,
+                            dl_volume, ul_volume, rlc_delay, prb_dl, prb_ul)
+
+def format_log_entry(entry_id: int, latency: int, dl_throughput: float, ul_throughput: float,
+                     dl_volume: int, ul_volume: int, rlc_delay: float, prb_dl: int, prb_ul: int) -> str:
+    """Format one log entry in the xApp's KPM indication layout."""
+    return _TEMPLATE % (entry_id, latency, dl_volume, ul_volume, rlc_delay,
+                        dl_throughput, ul_throughput, prb_dl, prb_ul)
+
+def draw_fields(rng: np.random.Generator, n: int) -> dict:
+    """Draw the random values of n log entries at once, one array per field."""
+    return {
+        'latency_offset': rng.integers(-1_000_000, 1_000_001, size=n, dtype=np.int64),
+        'dl_throughput': rng.uniform(100000, 1500000, n),  # 100-1500 kbps
+        'ul_throughput': rng.uniform(1000, 15000, n),      # 1-15 kbps
+        'dl_volume_mul': rng.uniform(0.8, 1.2, n),
+        'ul_volume_mul': rng.uniform(0.8, 1.2, n),
+        'rlc_delay': rng.uniform(3000, 8000, n),           # 3-8 ms
+        'prb_dl_mul': rng.uniform(0.1, 0.2, n),
+        'prb_ul_mul': rng.uniform(0.5, 1.0, n),
+    }
+
+def entry_columns(fields: dict, start_id: int) -> tuple:
+    """
+    Derive every _TEMPLATE column from drawn fields, whole arrays at a time.
+    
+    Volumes and PRBs are truncated with astype like int() did per entry; the
+    columns come back as plain Python lists, ready for zip and % formatting.
+    """
+    dl = fields['dl_throughput']
+    ul = fields['ul_throughput']
+    return (
+        range(start_id, start_id + len(dl)),
+        (BASE_LATENCY + fields['latency_offset']).tolist(),
+        (dl * fields['dl_volume_mul']).astype(np.int64).tolist(),
+        (ul * fields['ul_volume_mul']).astype(np.int64).tolist(),
+        fields['rlc_delay'].tolist(),
+        dl.tolist(),
+        ul.tolist(),
+        (dl * fields['prb_dl_mul']).astype(np.int64).tolist(),
+        (ul * fields['prb_ul_mul']).astype(np.int64).tolist(),
+    )
+
+def append_log_entries(buf: bytearray, start_id: int, n: int) -> None:
+    """Format n consecutive log entries from start_id onto the end of buf."""
+    for values in zip(*entry_columns(draw_fields(RNG, n), start_id)):
+        buf += _TEMPLATE_B % values
+
+def generate_log_entries(start_id: int, n: int) -> bytes:
+    """Generate n consecutive log entries from start_id as one UTF-8 chunk."""
+    buf = bytearray()
+    append_log_entries(buf, start_id, n)
+    return bytes(buf)
+
+def write_all(fd: int, data) -> None:
+    """Write all of data to fd, retrying on short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def writev_all(fd: int, chunks: list) -> None:
+    """Write chunks to fd in gathered writev calls, without joining them first."""
+    if not hasattr(os, 'writev'):  # Windows
+        write_all(fd, b"".join(chunks))
+        return
+    
+    views = [memoryview(chunk) for chunk in chunks]
+    while views:
+        written = os.writev(fd, views)
+        # Drop fully written buffers and trim the one a short write ended in
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if views:
+            views[0] = views[0][written:]
+
+def drop_page_cache(fd: int) -> None:
+    """Sync fd and let the kernel evict its pages; nothing here re-reads them."""
+    os.fsync(fd)
+    if hasattr(os, 'posix_fadvise'):  # not available on macOS/Windows
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+class BackgroundWriter:
+    """
+    Append queued byte chunks to a file descriptor from a dedicated thread.
+    
+    The queue is bounded, so a stalled disk only lets the generator run
+    QUEUE_DEPTH flushes ahead before write() starts blocking.
+    """
+    
+    QUEUE_DEPTH = 1024
+    MAX_BATCH = 64
+    
+    def __init__(self, fd: int, drop_cache: bool = False):
+        self.fd = fd
+        self.drop_cache = drop_cache
+        self.error = None
+        self.queue = queue.Queue(maxsize=self.QUEUE_DEPTH)
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+    
+    def write(self, data: bytes):
+        """Hand data to the writer thread."""
+        if self.error is not None:
+            raise self.error
+        self.queue.put(data)
+    
+    def close(self):
+        """Write out everything still queued and stop the thread."""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+    
+    def _run(self):
+        while True:
+            chunks = [self.queue.get()]
+            # Gather whatever else is already waiting into the same syscall
+            while chunks[-1] is not None and len(chunks) < self.MAX_BATCH:
+                try:
+                    chunks.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            done = chunks[-1] is None
+            if done:
+                chunks.pop()
+            
+            # After a failure keep draining so the producer never blocks on put
+            if chunks and self.error is None:
+                try:
+                    writev_all(self.fd, chunks)
+                    if self.drop_cache:
+                        drop_page_cache(self.fd)
+                except OSError as e:
+                    self.error = e
+            
+            if done:
+                return
 
 def main():
     parser = argparse.ArgumentParser(description="Simulate real-time 5G log data")
@@ -67,6 +241,36 @@ def main():
         default=100,
         help="Number of entries to generate (default: 100, use -1 for infinite)"
     )
+    parser.add_argument(
+        "--flush-bytes",
+        type=int,
+        default=1 << 20,
+        help="Write buffered entries once this many bytes are pending (default: 1 MiB)"
+    )
+    parser.add_argument(
+        "--flush-secs",
+        type=float,
+        default=1.0,
+        help="Longest time an entry may stay buffered before being written (default: 1.0)"
+    )
+    parser.add_argument(
+        "--status-every",
+        type=int,
+        default=50,
+        help="Refresh the status line every this many entries, or at least once a second (default: 50)"
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Don't print a status line while generating"
+    )
+    parser.add_argument(
+        "--drop-cache",
+        action="store_true",
+        help="fsync each flush and drop the written pages from the page cache "
+             "(slower for anyone tailing the file)"
+    )
     
     args = parser.parse_args()
     
@@ -78,29 +282,91 @@ def main():
     print(f"Entries: {'infinite' if args.entries == -1 else args.entries}")
     print("Press Ctrl+C to stop\n")
     
-    # Write initial header if file doesn't exist
-    if not output_file.exists():
-        with open(output_file, 'w') as f:
-            f.write("[UTIL]: Setting the config -c file to /local/etc/flexric/flexric.conf\n")
-            f.write("[UTIL]: Setting path -p for the shared libraries to /local/lib/flexric/\n")
-            f.write("[xAapp]: Initializing ...\n")
-            f.write("[xApp]: nearRT-RIC IP Address = 127.0.0.1, PORT = 36422\n")
-            f.write("Connected E2 nodes = 1\n")
-            f.write("[xApp]: Successfully subscribed to RAN_FUNC_ID 2\n\n")
+    # Write initial header if file doesn't exist; O_EXCL makes the check and
+    # the create one step, so two simulators can't both write a header
+    try:
+        fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                     | getattr(os, 'O_CLOEXEC', 0), 0o644)
+    except FileExistsError:
+        pass
+    else:
+        try:
+            write_all(fd, HEADER_BYTES)
+        finally:
+            os.close(fd)
     
+    buf = bytearray()
+    batch = bytearray()
     entry_id = 1
     try:
-        while args.entries == -1 or entry_id <= args.entries:
-            log_entry = generate_log_entry(entry_id)
-            
-            with open(output_file, 'a') as f:
-                f.write(log_entry)
-                f.flush()  # Ensure data is written immediately
-            
-            print(f"Added entry {entry_id} at {time.strftime('%H:%M:%S')}")
+        # One descriptor for the whole run rather than an open/close per entry;
+        # buf is the only buffering layer, and the writes themselves happen on
+        # a background thread so generation never waits on the disk
+        fd = os.open(output_file, OPEN_FLAGS, 0o644)
+        writer = BackgroundWriter(fd, drop_cache=args.drop_cache)
+        start = time.monotonic()
+        last_flush = start
+        last_status = start
+        last_status_id = 0
+        try:
+            while args.entries == -1 or entry_id <= args.entries:
+                # Emit every tick that has come due since the last pass in one
+                # batch, so a stall doesn't leave the run behind schedule
+                now = time.monotonic()
+                if args.interval > 0:
+                    n = int((now - start) / args.interval) + 2 - entry_id
+                else:
+                    # Nothing to pace: stream BATCH_SIZE entries at a time, so
+                    # even huge --interval 0 runs stay in constant memory
+                    n = BATCH_SIZE
+                n = max(1, min(n, BATCH_SIZE))
+                if args.entries != -1:
+                    n = min(n, args.entries - entry_id + 1)
+                
+                # Format into scratch space first and only then extend buf and
+                # the count together, so Ctrl+C mid-batch can't flush entries
+                # that the final count leaves out
+                batch.clear()
+                append_log_entries(batch, entry_id, n)
+                buf += batch
+                entry_id += n
+                
+                # Flush when the next entry would arrive past the window, so
+                # slow intervals still get every entry on disk straight away
+                if (len(buf) >= args.flush_bytes
+                        or now + args.interval - last_flush >= args.flush_secs):
+                    writer.write(bytes(buf))
+                    buf.clear()
+                    last_flush = now
+                
+                # One overwritten status line instead of a printed line per entry
+                if not args.quiet and (entry_id - 1 - last_status_id >= args.status_every
+                                       or now - last_status >= 1.0):
+                    sys.stdout.write(f"\r[{time.strftime('%H:%M:%S')}] {entry_id - 1} entries")
+                    sys.stdout.flush()
+                    last_status = now
+                    last_status_id = entry_id - 1
+                
+                # Absolute deadlines keep the period at --interval however long
+                # the work between sleeps takes
+                deadline = start + (entry_id - 1) * args.interval
+                now = time.monotonic()
+                if deadline > now:
+                    time.sleep(deadline - now)
             
-            entry_id += 1
-            time.sleep(args.interval)
+            if not args.quiet:
+                # End the status line, refreshing it only if it is behind
+                if last_status_id != entry_id - 1:
+                    sys.stdout.write(f"\r[{time.strftime('%H:%M:%S')}] {entry_id - 1} entries")
+                print()
+        finally:
+            # Don't lose whatever is still buffered on Ctrl+C
+            try:
+                if buf:
+                    writer.write(bytes(buf))
+                writer.close()
+            finally:
+                os.close(fd)
             
     except KeyboardInterrupt:
         print(f"\nStopped simulation. Generated {entry_id - 1} entries.")